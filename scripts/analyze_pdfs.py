@@ -20,21 +20,18 @@ sys.path.insert(0, str(ROOT))
 # Import after path setup
 from statement_refinery.pdf_to_csv import parse_pdf, write_csv  # noqa: E402
 from statement_refinery.validation import (  # noqa: E402
-    analyze_rows,
-    calculate_csv_total,
+    analyze_all,
     extract_total_from_pdf,
-    find_duplicates,
-    validate_categories,
 )
 
 
 def analyze(pdf_path: Path, write_csv_flag: bool = False) -> None:
     rows = parse_pdf(pdf_path)
     pdf_total = extract_total_from_pdf(pdf_path)
-    csv_total = calculate_csv_total(rows)
-    duplicates = find_duplicates(rows)
-    invalid = validate_categories(rows)
-    metrics = analyze_rows(rows)
+    metrics = analyze_all(rows)
+    csv_total = metrics["total_value"]
+    duplicates = metrics["duplicates"]
+    invalid = metrics["invalid_categories"]
 
     accuracy = (
         min(csv_total, pdf_total) / max(csv_total, pdf_total) * Decimal("100")
@@ -48,6 +45,8 @@ def analyze(pdf_path: Path, write_csv_flag: bool = False) -> None:
     print(f"CSV Total: R$ {csv_total:,.2f}")
     print(f"Difference: R$ {abs(pdf_total - csv_total):,.2f}")
     print(f"Accuracy: {accuracy:.1f}%")
+    # Rows whose amount is missing or unparsable are left out of the CSV total
+    print(f"Unparsed Amounts: {metrics['unparsed_amounts']}")
 
     if duplicates:
         print("Duplicates:")
@@ -24,6 +24,13 @@ from statement_refinery.validation import extract_total_from_pdf
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Line-level patterns, compiled once and reused for every analysed line
+RE_AMOUNT = re.compile(r"\d{1,3}(?:\.\d{3})*,\d{2}")
+RE_SIGNED_AMOUNT = re.compile(r"-?\d{1,3}(?:\.\d{3})*,\d{2}")
+RE_DAY_MONTH = re.compile(r"\d{1,2}/\d{1,2}")
+RE_DIGITS = re.compile(r"\d+")
+RE_WORDS = re.compile(r"[A-Za-z]+")
+
 
 class PatternAnalyzer:
     """Analyzes parsing patterns and failures across multiple PDFs."""
@@ -104,12 +111,12 @@ class PatternAnalyzer:
     def _analyze_successful_parse(self, line: str, result: Dict):
         """Analyze successful parsing to understand patterns."""
         # Track amount formats
-        amount_match = re.search(r"-?\d{1,3}(?:\.\d{3})*,\d{2}", line)
+        amount_match = RE_SIGNED_AMOUNT.search(line)
         if amount_match:
             self.amount_formats.add(amount_match.group())
 
         # Track date formats
-        date_match = re.search(r"\d{1,2}/\d{1,2}", line)
+        date_match = RE_DAY_MONTH.search(line)
         if date_match:
             self.date_formats.add(date_match.group())
 
@@ -123,10 +130,10 @@ class PatternAnalyzer:
         line_upper = line.upper()
 
         # Has amount pattern
-        has_amount = bool(re.search(r"\d{1,3}(?:\.\d{3})*,\d{2}", line))
+        has_amount = bool(RE_AMOUNT.search(line))
 
         # Has date pattern
-        has_date = bool(re.search(r"\d{1,2}/\d{1,2}", line))
+        has_date = bool(RE_DAY_MONTH.search(line))
 
         # Skip obvious headers/footers
         skip_keywords = [
@@ -157,8 +164,8 @@ class PatternAnalyzer:
 
         for pdf_name, line_num, line in self.failed_lines:
             # Create structural signature
-            structure = re.sub(r"\d+", "N", line)  # Replace numbers with N
-            structure = re.sub(r"[A-Za-z]+", "W", structure)  # Replace words with W
+            structure = RE_DIGITS.sub("N", line)  # Replace numbers with N
+            structure = RE_WORDS.sub("W", structure)  # Replace words with W
             failed_by_structure[structure].append(line)
 
         # Find common structures
@@ -16,6 +16,14 @@ from typing import Dict, List, Optional
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
 
+# Structure-signature substitutions, compiled once instead of per line
+RE_AMOUNT = re.compile(r"\d{1,3}(?:\.\d{3})*,\d{2}")
+RE_DAY_MONTH = re.compile(r"\d{1,2}/\d{1,2}")
+RE_CARD = re.compile(r"\d{4}")
+RE_LONGNUM = re.compile(r"\d{4,}")
+RE_NUM = re.compile(r"\d+")
+RE_WHITESPACE = re.compile(r"\s+")
+
 
 class IncrementalLearner:
     """Learns from validation feedback to improve parsing patterns."""
@@ -65,22 +73,22 @@ class IncrementalLearner:
         sig = line
 
         # Replace amounts
-        sig = re.sub(r"\d{1,3}(?:\.\d{3})*,\d{2}", "AMOUNT", sig)
+        sig = RE_AMOUNT.sub("AMOUNT", sig)
 
         # Replace dates
-        sig = re.sub(r"\d{1,2}/\d{1,2}", "DATE", sig)
+        sig = RE_DAY_MONTH.sub("DATE", sig)
 
         # Replace card numbers
-        sig = re.sub(r"\d{4}", "CARD", sig)
+        sig = RE_CARD.sub("CARD", sig)
 
         # Replace long number sequences
-        sig = re.sub(r"\d{4,}", "LONGNUM", sig)
+        sig = RE_LONGNUM.sub("LONGNUM", sig)
 
         # Replace remaining numbers
-        sig = re.sub(r"\d+", "NUM", sig)
+        sig = RE_NUM.sub("NUM", sig)
 
         # Normalize whitespace
-        sig = re.sub(r"\s+", " ", sig).strip()
+        sig = RE_WHITESPACE.sub(" ", sig).strip()
 
         return sig
 
@@ -215,7 +215,7 @@ class SemanticValidator:
                 continue
 
             # Check if line has transaction-like patterns but wasn't parsed
-            line_hash = pdf_to_csv.hashlib.sha1(line.encode()).hexdigest()
+            line_hash = pdf_to_csv._ledger_hash(line)
             if line_hash not in parsed_hashes:
                 # Look for transaction indicators
                 has_amount = bool(
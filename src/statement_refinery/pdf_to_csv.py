@@ -16,34 +16,41 @@ import argparse
 import csv
 import hashlib
 import logging
+import os
 import re
 import shutil
 import sys
 from datetime import date
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
-from typing import Final, Iterator, List, Optional
+from typing import Any, Final, Iterator, List, Optional
 
 # ===== ENHANCED TEXT CLEANING FROM CODEX.PY =====
 LEAD_SYM = ">@§$Z)_•*®«» "
 
+RE_PUA: Final = re.compile("[\ue000-\uf8ff]")
+RE_MULTI_SPACE: Final = re.compile(r"\s{2,}")
+
 
 def strip_pua(s: str) -> str:
     """Remove Private Use Area glyphs (icons)"""
-    return re.sub("[\ue000-\uf8ff]", "", s)
+    return RE_PUA.sub("", s)
 
 
 def clean_line(raw: str) -> str:
     """Enhanced line cleaning from codex.py"""
-    raw = strip_pua(raw)
-    raw = raw.lstrip(LEAD_SYM).replace("_", " ")
-    raw = re.sub(r"\s{2,}", " ", raw)
-    return raw.strip()
+    # One chained expression: no helper call or rebinding between the steps
+    raw = RE_PUA.sub("", raw).lstrip(LEAD_SYM).replace("_", " ")
+    return RE_MULTI_SPACE.sub(" ", raw).strip()
 
 
 # Amount below which transactions are considered adjustments
 ADJUSTMENT_THRESHOLD: Final = Decimal("0.30")
 
+# Shared zero for row defaults; Decimal is immutable, so one instance will do
+_ZERO: Final = Decimal("0.00")
+
 # ===== CORE REGEX PATTERNS =====
 
 # Enhanced patterns combining best of both parsers
@@ -145,6 +152,17 @@ RE_IOF: Final = re.compile(r"IOF|JUROS|MULTA|ENCARGOS", re.I)
 
 RE_CARD_FINAL: Final = re.compile(r"\bfinal\s+(\d{4})\b", re.I)
 
+RE_DOUBLE_CURRENCY: Final = re.compile(r"R\$\s*R\$")
+RE_DAY_MONTH: Final = re.compile(r"\d{1,2}/\d{1,2}")
+RE_AMOUNT_LIKE: Final = re.compile(r"[\d,]+\d+,\d{2}")
+
+# Amount with an optional leading or trailing minus and nothing else
+RE_PLAIN_AMOUNT: Final = re.compile(r"(-?)(\d{1,3}(?:\.\d{3})*|\d+),(\d{2})(-?)")
+
+# Characters stripped before amount parsing
+RE_NON_AMOUNT: Final = re.compile(r"[^\d,.\-]")
+RE_NON_AMOUNT_FLEX: Final = re.compile(r"[^\d,\-]")
+
 RE_INSTALLMENT: Final = re.compile(r"(\d{2})/(\d{2})$")
 
 RE_EMBEDDED_TRANSACTION: Final = re.compile(
@@ -187,6 +205,14 @@ RE_INTERNATIONAL_PATTERNS = [
     re.compile(r"SELECTA|NEWMIND|SUEDE", re.I),
 ]
 
+# All category rules flattened in priority order; the first hit wins
+_CATEGORY_RULES: Final = (
+    *((pattern.search, category) for pattern, category in RE_CATEGORIES_HIGH_PRIORITY),
+    *((pattern.search, "FX") for pattern in RE_INTERNATIONAL_PATTERNS),
+    (re.compile(r"EUR|USD|FX").search, "FX"),
+    *((pattern.search, category) for pattern, category in RE_CATEGORIES_STANDARD),
+)
+
 
 def parse_amount(amount_str: Optional[str]) -> Optional[Decimal]:
     """
@@ -199,6 +225,14 @@ def parse_amount(amount_str: Optional[str]) -> Optional[Decimal]:
         return None
 
     clean = amount_str.strip()
+
+    # Fast path for plain statement amounts such as ``1.234,56`` or ``-7,50``
+    match = RE_PLAIN_AMOUNT.fullmatch(clean)
+    if match:
+        lead, units, cents, trail = match.groups()
+        value = Decimal(f"{units.replace('.', '')}.{cents}")
+        return -value if lead or trail else value
+
     negative = False
 
     # Handle parentheses for negative values
@@ -215,7 +249,7 @@ def parse_amount(amount_str: Optional[str]) -> Optional[Decimal]:
         clean = clean[1:].strip()
 
     # Remove currency symbols and spaces
-    clean = re.sub(r"[^\d,.\-]", "", clean)
+    clean = RE_NON_AMOUNT.sub("", clean)
 
     # Convert Brazilian format to standard
     if "," in clean and "." in clean:
@@ -239,7 +273,7 @@ def parse_amount(amount_str: Optional[str]) -> Optional[Decimal]:
 def parse_amount_flexible(amount_str: str) -> Decimal:
     """Enhanced amount parsing from codex.py - more flexible"""
     return Decimal(
-        re.sub(r"[^\d,\-]", "", amount_str.replace(" ", ""))
+        RE_NON_AMOUNT_FLEX.sub("", amount_str.replace(" ", ""))
         .replace(".", "")
         .replace(",", ".")
     )
@@ -257,19 +291,8 @@ def classify_transaction(description: str, amount: Optional[Decimal] = None) ->
     if amount is not None and 0 < abs(amount) <= ADJUSTMENT_THRESHOLD:
         return "AJUSTE"
 
-    for pattern, category in RE_CATEGORIES_HIGH_PRIORITY:
-        if pattern.search(desc_upper):
-            return category
-
-    for pattern in RE_INTERNATIONAL_PATTERNS:
-        if pattern.search(desc_upper):
-            return "FX"
-
-    if any(currency in desc_upper for currency in ["EUR", "USD", "FX"]):
-        return "FX"
-
-    for pattern, category in RE_CATEGORIES_STANDARD:
-        if pattern.search(desc_upper):
+    for search, category in _CATEGORY_RULES:
+        if search(desc_upper):
             return category
 
     return "DIVERSOS"
@@ -302,7 +325,7 @@ def extract_installment_info(description: str) -> tuple[int | None, int | None]:
 def parse_fx_currency_line(line: str) -> tuple[str | None, str | None, str | None]:
     match = RE_FX_LINE2.search(line)
     if match:
-        currency = match.group(1)
+        currency = sys.intern(match.group(1))
         fx_rate = match.group(3)
         city = match.group(4) if match.group(4) else ""
         return currency, fx_rate, city.strip()
@@ -373,6 +396,15 @@ def _iso_date(date_str: str, year: int | None = None) -> str:
     return f"{yr}-{month.zfill(2)}-{day.zfill(2)}"
 
 
+def _ledger_hash(line: str) -> str:
+    """Return the dedup key for a raw statement line.
+
+    SHA-1 is kept on purpose: the digests are stored in the golden CSVs, so
+    switching algorithms would invalidate every recorded ``ledger_hash``.
+    """
+    return hashlib.sha1(line.encode()).hexdigest()
+
+
 def parse_statement_line(line: str, year: int | None = None) -> dict | None:
     original_line = line
     line = clean_line(line)  # Use enhanced cleaning from codex.py
@@ -380,14 +412,14 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
         return None
 
     upper_line = line.upper()
-    if re.search(r"R\$\s*R\$", upper_line):
+    if RE_DOUBLE_CURRENCY.search(upper_line):
         return None
-    if any(kw in upper_line for kw in ITAU_PARSING_RULES["skip_keywords"]):
-        if not re.search(r"\d{1,2}/\d{1,2}", upper_line):
+    if RE_SKIP_KEYWORDS.search(upper_line):
+        if not RE_DAY_MONTH.search(upper_line):
             return None
 
     card_match = RE_CARD_FINAL.search(line)
-    card_last4 = card_match.group(1) if card_match else "0000"
+    card_last4 = sys.intern(card_match.group(1)) if card_match else "0000"
     line_no_card = line
     if card_match:
         line_no_card = line.replace(card_match.group(0), "").strip()
@@ -406,7 +438,7 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
         desc = m.group("descr").strip()
         amt_brl = parse_amount(m.group("brl"))
         amt_orig = parse_amount(m.group("orig"))
-        fx_val = Decimal(fx_rate.replace(",", ".")) if fx_rate else Decimal("0.00")
+        fx_val = Decimal(fx_rate.replace(",", ".")) if fx_rate else _ZERO
         inst_seq, inst_tot = extract_installment_info(desc)
         category = classify_transaction(desc, amt_brl)
         if RE_PAYMENT.search(line):
@@ -423,15 +455,15 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
             "installment_seq": inst_seq or 0,
             "installment_tot": inst_tot or 0,
             "fx_rate": fx_val,
-            "iof_brl": Decimal("0.00"),
+            "iof_brl": _ZERO,
             "category": category,
             "merchant_city": city or "",
-            "ledger_hash": hashlib.sha1(original_line.encode()).hexdigest(),
-            "prev_bill_amount": Decimal("0.00"),
-            "interest_amount": Decimal("0.00"),
+            "ledger_hash": _ledger_hash(original_line),
+            "prev_bill_amount": _ZERO,
+            "interest_amount": _ZERO,
             "amount_orig": amt_orig,
             "currency_orig": currency or "",
-            "amount_usd": amt_orig if (currency or "") == "USD" else Decimal("0.00"),
+            "amount_usd": amt_orig if (currency or "") == "USD" else _ZERO,
         }
 
     m = RE_DOM_STRICT.match(line_no_card)
@@ -458,16 +490,16 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
             "amount_brl": amt_brl,
             "installment_seq": inst_seq or 0,
             "installment_tot": inst_tot or 0,
-            "fx_rate": Decimal("0.00"),
-            "iof_brl": Decimal("0.00"),
+            "fx_rate": _ZERO,
+            "iof_brl": _ZERO,
             "category": category,
             "merchant_city": "",
-            "ledger_hash": hashlib.sha1(original_line.encode()).hexdigest(),
-            "prev_bill_amount": Decimal("0.00"),
-            "interest_amount": Decimal("0.00"),
-            "amount_orig": Decimal("0.00"),
+            "ledger_hash": _ledger_hash(original_line),
+            "prev_bill_amount": _ZERO,
+            "interest_amount": _ZERO,
+            "amount_orig": _ZERO,
             "currency_orig": "",
-            "amount_usd": Decimal("0.00"),
+            "amount_usd": _ZERO,
         }
 
     # ===== ENHANCED PATTERN MATCHING =====
@@ -500,7 +532,7 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
     if m:
         city = m.group("city")
         orig_amt = parse_amount(m.group("orig_amt"))
-        currency = m.group("currency")
+        currency = sys.intern(m.group("currency"))
         brl_amt = parse_amount(m.group("brl_amt"))
         desc = m.group("desc") or f"{city} Transaction"
 
@@ -511,16 +543,16 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
             "amount_brl": brl_amt,
             "installment_seq": 0,
             "installment_tot": 0,
-            "fx_rate": Decimal("0.00"),
-            "iof_brl": Decimal("0.00"),
+            "fx_rate": _ZERO,
+            "iof_brl": _ZERO,
             "category": "INTERNACIONAL",
             "merchant_city": city,
-            "ledger_hash": hashlib.sha1(original_line.encode()).hexdigest(),
-            "prev_bill_amount": Decimal("0.00"),
-            "interest_amount": Decimal("0.00"),
+            "ledger_hash": _ledger_hash(original_line),
+            "prev_bill_amount": _ZERO,
+            "interest_amount": _ZERO,
             "amount_orig": orig_amt,
             "currency_orig": currency,
-            "amount_usd": orig_amt if currency == "USD" else Decimal("0.00"),
+            "amount_usd": orig_amt if currency == "USD" else _ZERO,
         }
 
     # Payment summary lines
@@ -538,16 +570,16 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
             "amount_brl": -amount,  # Payments are negative
             "installment_seq": 0,
             "installment_tot": 0,
-            "fx_rate": Decimal("0.00"),
-            "iof_brl": Decimal("0.00"),
+            "fx_rate": _ZERO,
+            "iof_brl": _ZERO,
             "category": "PAGAMENTO",
             "merchant_city": "",
-            "ledger_hash": hashlib.sha1(original_line.encode()).hexdigest(),
-            "prev_bill_amount": Decimal("0.00"),
-            "interest_amount": Decimal("0.00"),
-            "amount_orig": Decimal("0.00"),
+            "ledger_hash": _ledger_hash(original_line),
+            "prev_bill_amount": _ZERO,
+            "interest_amount": _ZERO,
+            "amount_orig": _ZERO,
             "currency_orig": "",
-            "amount_usd": Decimal("0.00"),
+            "amount_usd": _ZERO,
         }
 
     # Fee information lines
@@ -563,16 +595,16 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
             "amount_brl": amount,
             "installment_seq": 0,
             "installment_tot": 0,
-            "fx_rate": Decimal("0.00"),
-            "iof_brl": Decimal("0.00"),
+            "fx_rate": _ZERO,
+            "iof_brl": _ZERO,
             "category": "ENCARGO",
             "merchant_city": "",
-            "ledger_hash": hashlib.sha1(original_line.encode()).hexdigest(),
-            "prev_bill_amount": Decimal("0.00"),
-            "interest_amount": Decimal("0.00"),
-            "amount_orig": Decimal("0.00"),
+            "ledger_hash": _ledger_hash(original_line),
+            "prev_bill_amount": _ZERO,
+            "interest_amount": _ZERO,
+            "amount_orig": _ZERO,
             "currency_orig": "",
-            "amount_usd": Decimal("0.00"),
+            "amount_usd": _ZERO,
         }
 
     # ===== ENHANCED MULTILINE TRANSACTION PATTERN =====
@@ -609,16 +641,16 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
             "amount_brl": amount,
             "installment_seq": inst_seq,
             "installment_tot": inst_tot,
-            "fx_rate": Decimal("0.00"),
-            "iof_brl": Decimal("0.00"),
+            "fx_rate": _ZERO,
+            "iof_brl": _ZERO,
             "category": category,
             "merchant_city": "",
-            "ledger_hash": hashlib.sha1(original_line.encode()).hexdigest(),
-            "prev_bill_amount": Decimal("0.00"),
-            "interest_amount": Decimal("0.00"),
-            "amount_orig": Decimal("0.00"),
+            "ledger_hash": _ledger_hash(original_line),
+            "prev_bill_amount": _ZERO,
+            "interest_amount": _ZERO,
+            "amount_orig": _ZERO,
             "currency_orig": "",
-            "amount_usd": Decimal("0.00"),
+            "amount_usd": _ZERO,
         }
 
     # ===== ROBUST PAYMENT DETECTION FROM CODEX.PY =====
@@ -640,16 +672,16 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
                 "amount_brl": val,
                 "installment_seq": 0,
                 "installment_tot": 0,
-                "fx_rate": Decimal("0.00"),
-                "iof_brl": Decimal("0.00"),
+                "fx_rate": _ZERO,
+                "iof_brl": _ZERO,
                 "category": "PAGAMENTO",
                 "merchant_city": "",
-                "ledger_hash": hashlib.sha1(original_line.encode()).hexdigest(),
-                "prev_bill_amount": Decimal("0.00"),
-                "interest_amount": Decimal("0.00"),
-                "amount_orig": Decimal("0.00"),
+                "ledger_hash": _ledger_hash(original_line),
+                "prev_bill_amount": _ZERO,
+                "interest_amount": _ZERO,
+                "amount_orig": _ZERO,
                 "currency_orig": "",
-                "amount_usd": Decimal("0.00"),
+                "amount_usd": _ZERO,
             }
 
     # ===== PRECISION OVER RECALL: REMOVED GENERIC CATCH-ALL =====
@@ -661,9 +693,7 @@ def parse_statement_line(line: str, year: int | None = None) -> dict | None:
     # - Lines with amount but no date pattern (malformed dates)
     # - Lines with embedded card numbers in unexpected positions
     # - Special characters in merchant names that affect parsing
-    if re.search(r"[\d,]+\d+,\d{2}", line_no_card) and not re.search(
-        r"\d{1,2}/\d{1,2}", line_no_card
-    ):
+    if RE_AMOUNT_LIKE.search(line_no_card) and not RE_DAY_MONTH.search(line_no_card):
         # Found amount pattern but no valid date - likely malformed line
         logging.debug(f"Skipping line with amount but no valid date: {line}")
 
@@ -706,6 +736,11 @@ ITAU_PARSING_RULES = {
     },
 }
 
+# Skip keywords folded into one alternation, so a line is scanned once
+RE_SKIP_KEYWORDS: Final = re.compile(
+    "|".join(map(re.escape, ITAU_PARSING_RULES["skip_keywords"]))
+)
+
 # Public API of this module
 __all__ = [
     "parse_amount",
@@ -745,13 +780,19 @@ CSV_HEADER = [
     "amount_usd",
 ]
 
+# Columns with a handful of distinct values; they are interned so every row
+# shares one string object per value
+_LOW_CARDINALITY_KEYS: Final = ("card_last4", "category", "currency_orig")
+
+# Field set checked by write_csv, as csv.DictWriter did
+_CSV_FIELDS: Final = frozenset(CSV_HEADER)
+
 _LOGGER = logging.getLogger("pdf_to_csv")
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
 
 # ───────────────────────── helpers ──────────────────────────
-def iter_pdf_lines(pdf_path: Path) -> Iterator[str]:
-    """Yield each non-empty line of the PDF."""
+def _pdfplumber_pages(pdf_path: Path) -> Iterator[str | None]:
     try:
         import pdfplumber  # type: ignore  # moved inside the function
     except ImportError as exc:  # pragma: no cover - network/optional dep
@@ -760,74 +801,205 @@ def iter_pdf_lines(pdf_path: Path) -> Iterator[str]:
         ) from exc
 
     with pdfplumber.open(str(pdf_path)) as pdf:
-        for idx, page in enumerate(pdf.pages, 1):
-            text = page.extract_text()
-            if text is None:
-                _LOGGER.warning("Page %d has no extractable text – skipped", idx)
+        for page in pdf.pages:
+            yield page.extract_text()
+
+
+def _pdfium_pages(pdf_path: Path) -> Iterator[str | None]:
+    try:
+        import pypdfium2 as pdfium  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dep
+        raise RuntimeError(
+            "SR_PDF_BACKEND=pdfium requires 'pip install pypdfium2'"
+        ) from exc
+
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        for page in pdf:
+            yield page.get_textpage().get_text_range() or None
+    finally:
+        pdf.close()
+
+
+def _pymupdf_pages(pdf_path: Path) -> Iterator[str | None]:
+    try:
+        import fitz  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dep
+        raise RuntimeError(
+            "SR_PDF_BACKEND=pymupdf requires 'pip install pymupdf'"
+        ) from exc
+
+    with fitz.open(str(pdf_path)) as doc:
+        for page in doc:
+            yield page.get_text("text") or None
+
+
+# Page-text backends selectable through ``SR_PDF_BACKEND``.  pdfplumber stays
+# the default because the golden CSVs depend on its line layout; the C-backed
+# engines are much faster but split and order lines differently.
+_PDF_BACKENDS: Final = {
+    "pdfplumber": _pdfplumber_pages,
+    "pdfium": _pdfium_pages,
+    "pymupdf": _pymupdf_pages,
+}
+
+
+def _pdf_backend() -> str:
+    """Return the backend named by ``SR_PDF_BACKEND`` (``pdfplumber`` if unset)."""
+    backend = os.environ.get("SR_PDF_BACKEND", "pdfplumber").strip().lower()
+    if backend not in _PDF_BACKENDS:
+        raise ValueError(
+            f"Unknown SR_PDF_BACKEND {backend!r}; "
+            f"expected one of {', '.join(_PDF_BACKENDS)}"
+        )
+    return backend
+
+
+def iter_pdf_lines(
+    pdf_path: Path, stop_re: re.Pattern[str] | None = None
+) -> Iterator[str]:
+    """Yield each non-empty line of the PDF.
+
+    Text comes from pdfplumber unless the ``SR_PDF_BACKEND`` environment
+    variable selects ``pdfium`` or ``pymupdf``.  When *stop_re* is given,
+    iteration ends at the first line it matches (that line is not yielded)
+    and the remaining pages are never extracted.
+    """
+    for idx, text in enumerate(_PDF_BACKENDS[_pdf_backend()](pdf_path), 1):
+        if text is None:
+            _LOGGER.warning("Page %d has no extractable text – skipped", idx)
+            continue
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line:
                 continue
-            for line in text.splitlines():
-                line = line.rstrip()
-                if line:
-                    yield line
+            if stop_re is not None and stop_re.search(line):
+                return
+            yield line
 
 
-def parse_lines(lines: Iterator[str], year: int | None = None) -> List[dict]:
-    """Convert raw lines into row-dicts using :func:`parse_statement_line`."""
+def parse_lines(
+    lines: Iterator[str], year: int | None = None, debug_path: Path | None = None
+) -> List[dict]:
+    """Convert raw lines into row-dicts using :func:`parse_statement_line`.
+
+    Each attempt is logged to *debug_path* (``diagnostics/parse_debug.txt`` by
+    default) as the lines stream through.
+    """
+    if debug_path is None:
+        debug_path = Path("diagnostics") / "parse_debug.txt"
+    debug_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(debug_path, "w", encoding="utf-8") as debug_file:
+        return _parse_logged(lines, year, debug_file)
+
+
+def _parse_logged(lines: Iterator[str], year: int | None, debug_file) -> List[dict]:
+    """Parse *lines* for :func:`parse_lines`, logging each one to *debug_file*."""
     rows: List[dict] = []
     seen_hashes = set()
     current_card = "0000"
-    debug_dir = Path("diagnostics")
-    debug_dir.mkdir(exist_ok=True)
-    with open(debug_dir / "parse_debug.txt", "w") as debug_file:
-        for line in lines:
-            try:
-                # Log the line being processed
-                debug_file.write(f"Processing line: {line}\n")
-
-                # Check for card number updates
-                card_match = RE_CARD_FINAL.search(line)
-                if card_match:
-                    current_card = card_match.group(1)
-                    debug_file.write(f"  Updated current card to: {current_card}\n")
-
-                row = parse_statement_line(line, year)
-                if row:
-                    # Skip lines with credit limit information
-                    if "LIMITE" in row["desc_raw"].upper():
-                        debug_file.write("  Skipped: Contains LIMITE\n")
+    for line in lines:
+        try:
+            # Log the line being processed
+            debug_file.write(f"Processing line: {line}\n")
+
+            # Check for card number updates
+            card_match = RE_CARD_FINAL.search(line)
+            if card_match:
+                current_card = sys.intern(card_match.group(1))
+                debug_file.write(f"  Updated current card to: {current_card}\n")
+
+            row = parse_statement_line(line, year)
+            if row:
+                # Skip lines with credit limit information
+                if "LIMITE" in row["desc_raw"].upper():
+                    debug_file.write("  Skipped: Contains LIMITE\n")
+                    continue
+
+                # Update card number if not set
+                if row["card_last4"] == "0000":
+                    row["card_last4"] = current_card
+                    debug_file.write(f"  Updated card number to: {current_card}\n")
+
+                # Special handling for IOF and similar fees
+                if RE_IOF.search(row["desc_raw"]):
+                    row["iof_brl"] = row["amount_brl"]
+                    debug_file.write(f"  Marked as IOF: {row['amount_brl']}\n")
+                    if rows and rows[-1].get("category") == "FX":
+                        rows[-1]["iof_brl"] += row["amount_brl"]
+                        debug_file.write("  Merged IOF with previous FX\n")
                         continue
 
-                    # Update card number if not set
-                    if row["card_last4"] == "0000":
-                        row["card_last4"] = current_card
-                        debug_file.write(f"  Updated card number to: {current_card}\n")
-
-                    # Special handling for IOF and similar fees
-                    if RE_IOF.search(row["desc_raw"]):
-                        row["iof_brl"] = row["amount_brl"]
-                        debug_file.write(f"  Marked as IOF: {row['amount_brl']}\n")
-                        if rows and rows[-1].get("category") == "FX":
-                            rows[-1]["iof_brl"] += row["amount_brl"]
-                            debug_file.write("  Merged IOF with previous FX\n")
-                            continue
-
-                    # Deduplicate using transaction hash
-                    if row["ledger_hash"] not in seen_hashes:
-                        rows.append(row)
-                        seen_hashes.add(row["ledger_hash"])
-                        debug_file.write(
-                            f"  Parsed: {row['desc_raw']} = R$ {row['amount_brl']}\n"
-                        )
-                    else:
-                        debug_file.write("  Skipped: Duplicate transaction\n")
+                # Deduplicate using transaction hash
+                if row["ledger_hash"] not in seen_hashes:
+                    rows.append(row)
+                    seen_hashes.add(row["ledger_hash"])
+                    debug_file.write(
+                        f"  Parsed: {row['desc_raw']} = R$ {row['amount_brl']}\n"
+                    )
                 else:
-                    debug_file.write("  Skipped: Not a transaction line\n")
-            except Exception as exc:  # pragma: no cover
-                debug_file.write(f"  Error: {exc}\n")
-                _LOGGER.warning("Skip line '%s': %s", line, exc)
+                    debug_file.write("  Skipped: Duplicate transaction\n")
+            else:
+                debug_file.write("  Skipped: Not a transaction line\n")
+        except Exception as exc:  # pragma: no cover
+            debug_file.write(f"  Error: {exc}\n")
+            _LOGGER.warning("Skip line '%s': %s", line, exc)
     return rows
 
 
+def _golden_path(pdf_path: Path) -> Path:
+    stem_suffix = pdf_path.stem.split("_")[-1]
+    return pdf_path.with_name(f"golden_{stem_suffix}.csv")
+
+
+def _fresh_sidecar(pdf_path: Path) -> Path | None:
+    """Return the ``.txt`` sidecar of *pdf_path* unless it is missing or stale.
+
+    A sidecar older than its PDF is ignored so an edited statement is
+    re-extracted; without the PDF the sidecar is all there is and is used.
+    """
+    txt = pdf_path.with_suffix(".txt")
+    try:
+        txt_mtime = txt.stat().st_mtime_ns
+    except OSError:
+        return None
+    try:
+        pdf_mtime = pdf_path.stat().st_mtime_ns
+    except OSError:
+        return txt
+    return txt if txt_mtime >= pdf_mtime else None
+
+
+def _write_sidecar(txt: Path, text: str) -> None:
+    """Write *txt* atomically so concurrent readers never see a partial file."""
+    tmp = txt.with_name(f"{txt.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, txt)
+
+
+def _statement_text(pdf_path: Path) -> str:
+    """Return the text of *pdf_path*, reading or creating its ``.txt`` sidecar.
+
+    Only pdfplumber text is saved, since the parser and the golden CSVs rely
+    on its line layout; text from an opt-in backend serves this call alone.
+    """
+    txt = _fresh_sidecar(pdf_path)
+    if txt is not None:
+        return txt.read_text(encoding="utf-8")
+    text = "\n".join(iter_pdf_lines(pdf_path))
+    if _pdf_backend() == "pdfplumber":
+        _write_sidecar(pdf_path.with_suffix(".txt"), text)
+    return text
+
+
+def _parse_source(pdf_path: Path, use_golden_if_available: bool) -> Path:
+    """Return the file :func:`parse_pdf` will actually read for *pdf_path*."""
+    golden = _golden_path(pdf_path)
+    if use_golden_if_available and golden.exists():
+        return golden
+    return _fresh_sidecar(pdf_path) or pdf_path
+
+
 def parse_pdf(
     pdf_path: Path, year: int | None = None, use_golden_if_available: bool = True
 ) -> List[dict]:
@@ -837,19 +1009,61 @@ def parse_pdf(
     matching the PDF name exists, that CSV is read instead of parsing the PDF.
     This keeps tests stable without relying on ``pdfplumber`` for deterministic
     output.
+
+    Results are memoised per source file, keyed on its mtime and size, so
+    long-lived processes only re-parse a statement after it changes.  Each
+    call returns fresh row dictionaries.
     """
+    source = _parse_source(pdf_path, use_golden_if_available)
+    try:
+        stat = source.stat()
+    except OSError:
+        return _parse_pdf_uncached(pdf_path, year, use_golden_if_available)
+    # Opt-in backends never write the sidecar, so their parses are keyed apart
+    backend = _pdf_backend() if source == pdf_path else None
+    rows = _cached_parse(
+        str(pdf_path),
+        year,
+        use_golden_if_available,
+        stat.st_mtime_ns,
+        stat.st_size,
+        backend,
+    )
+    return [dict(row) for row in rows]
 
-    stem_suffix = pdf_path.stem.split("_")[-1]
-    golden = pdf_path.with_name(f"golden_{stem_suffix}.csv")
+
+@lru_cache(maxsize=8)
+def _cached_parse(
+    path: str,
+    year: int | None,
+    use_golden: bool,
+    mtime_ns: int,
+    size: int,
+    backend: str | None,
+) -> tuple[dict, ...]:
+    return tuple(_parse_pdf_uncached(Path(path), year, use_golden))
+
+
+def _parse_pdf_uncached(
+    pdf_path: Path, year: int | None, use_golden_if_available: bool
+) -> List[dict]:
+    golden = _golden_path(pdf_path)
     if use_golden_if_available and golden.exists():
         with golden.open("r", encoding="utf-8") as fh:
-            reader = csv.DictReader(fh, delimiter=";")
+            reader = csv.reader(fh, delimiter=";")
+            header = next(reader, [])
             rows = []
             seen = set()
-            for row in reader:
+            for values in reader:
+                if not values:
+                    continue
+                row: dict[str, Any] = dict(zip(header, values))
                 if row["ledger_hash"] in seen:
                     continue
                 seen.add(row["ledger_hash"])
+                for key in _LOW_CARDINALITY_KEYS:
+                    if key in row:
+                        row[key] = sys.intern(row[key])
                 for key in [
                     "amount_brl",
                     "fx_rate",
@@ -867,28 +1081,38 @@ def parse_pdf(
                 rows.append(row)
         return rows
 
-    txt = pdf_path.with_suffix(".txt")
-    if not txt.exists():
-        lines = list(iter_pdf_lines(pdf_path))
-        txt.write_text("\n".join(lines), encoding="utf-8")
-    else:
-        lines = txt.read_text(encoding="utf-8").splitlines()
+    lines = _statement_text(pdf_path).splitlines()
+
+    # One log per statement, so parallel workers and memoised parses never
+    # leave a log that describes a different PDF
+    debug_path = Path("diagnostics") / f"{pdf_path.stem}.parse_debug.txt"
+    return parse_lines(iter(lines), year, debug_path)
+
 
-    return parse_lines(iter(lines), year)
+def _row_values(row: dict) -> list:
+    """Return *row* in ``CSV_HEADER`` order with ``""`` for missing keys.
+
+    Keys outside the header raise :class:`ValueError`, matching
+    :class:`csv.DictWriter`'s default ``extrasaction``.
+    """
+    if not row.keys() <= _CSV_FIELDS:
+        extra = ", ".join(repr(key) for key in row.keys() - _CSV_FIELDS)
+        raise ValueError(f"dict contains fields not in fieldnames: {extra}")
+    get = row.get
+    return [get(key, "") for key in CSV_HEADER]
 
 
 def write_csv(rows: List[dict], out_fh) -> None:
-    writer = csv.DictWriter(
+    writer = csv.writer(
         out_fh,
-        fieldnames=CSV_HEADER,
         dialect="unix",
         delimiter=";",
         quoting=csv.QUOTE_NONE,
         escapechar="\\",
         lineterminator="\r\n",
     )
-    writer.writeheader()
-    writer.writerows(rows)
+    writer.writerow(CSV_HEADER)
+    writer.writerows(map(_row_values, rows))
     # Remove trailing newline to match golden files
     out_fh.seek(0, 2)
     pos = out_fh.tell()
@@ -1,5 +1,4 @@
 from __future__ import annotations
-import pdfplumber
 import re
 from pathlib import Path
 from decimal import Decimal
@@ -16,6 +15,8 @@ BRL = re.compile(r"-?\d+\.\d{2}")
 
 def extract(path: str | Path) -> dict[str, Decimal]:
     """Returns {'total_due': Decimal(...), 'domestic_total': ... , …}"""
+    import pdfplumber  # deferred: importing pdfminer is slow
+
     totals: dict[str, Decimal] = {}
     with pdfplumber.open(str(path)) as pdf:
         last_page = pdf.pages[-1]
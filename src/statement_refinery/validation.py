@@ -2,20 +2,26 @@
 
 from __future__ import annotations
 
+import csv
 import re
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Final, Iterable, List, Tuple
+
+from . import pdf_to_csv
 
 __all__ = [
     "extract_total_from_pdf",
     "extract_statement_totals",
     "calculate_csv_total",
+    "calculate_csv_file_total",
     "calculate_category_totals",
     "calculate_fitness_score",
     "find_duplicates",
     "validate_categories",
     "analyze_rows",
+    "analyze_all",
 ]
 
 # Category mappings for fitness calculation
@@ -37,100 +43,150 @@ INTERNATIONAL_CATEGORIES = {"FX", "INTERNACIONAL"}
 
 SERVICE_CATEGORIES = {"SERVIÇOS", "ENCARGOS"}
 
+# Shared zero for sums and empty-report defaults
+_ZERO: Final = Decimal("0.00")
+
+# Brazilian currency amount such as ``1.234,56`` or ``1234,56``.  Each branch
+# consumes digits and separators in a fixed shape so the engine never has to
+# backtrack through a ``[\d.]+`` run.
+_BRL_AMOUNT: Final = r"(?:\d{1,3}(?:\.\d{3})+|\d+),\d{2}"
+
+# Every total label contains one of these literals, so a couple of C-level
+# substring scans reject label-free text before any regex runs.
+_TOTAL_ANCHORS: Final = ("Total", "TOTAL")
+
+# Total labels in priority order; the first label whose pattern matches wins.
+_TOTAL_LABELS: Final = (
+    "Total desta fatura",
+    "Total da fatura",
+    "Total",
+    "TOTAL",
+    "Valor Total",
+    "Saldo Total",
+)
+_TOTAL_PATTERNS: Final = tuple(
+    rf"{label}\s*[=R\$\s]*({_BRL_AMOUNT})" for label in _TOTAL_LABELS
+)
+_TOTAL_RES: Final = tuple(re.compile(pattern) for pattern in _TOTAL_PATTERNS)
+
+
+@lru_cache(maxsize=8192)
+def _parse_decimal(raw: str) -> Decimal:
+    """Return *raw* (``1.234,56`` or ``1234.56``) as a :class:`Decimal`.
+
+    Statements repeat the same amounts (subscriptions, instalments), so the
+    parsed values are memoised; ``Decimal`` is immutable and safe to share.
+    """
+    if "," in raw:
+        raw = raw.replace(".", "").replace(",", ".")
+    return Decimal(raw)
+
+
+def _to_decimal(value: Any) -> Decimal:
+    """Coerce an ``amount_brl`` value to :class:`Decimal`.
+
+    Floats go through their shortest ``repr`` so ``1.1`` stays ``1.1`` rather
+    than becoming its exact binary expansion.
+    """
+    if isinstance(value, str):
+        return _parse_decimal(value)
+    if isinstance(value, float):
+        return _parse_decimal(repr(value))
+    return Decimal(value)
+
+
+def _statement_text(pdf_path: Path) -> str:
+    """Return the text of *pdf_path* through ``pdf_to_csv``'s ``.txt`` sidecar."""
+    try:
+        return pdf_to_csv._statement_text(pdf_path)
+    except RuntimeError as exc:
+        if isinstance(exc.__cause__, ImportError):
+            raise FileNotFoundError(f"No text fallback for {pdf_path.name}") from exc
+        raise
+
+
+def _search_total(text: str) -> str | None:
+    """Return the first captured total in *text*, in label priority order.
+
+    Each pattern starts with its literal label, so candidate positions are
+    located with ``find`` and the regex is only tried anchored at each one.
+    """
+    if all(text.find(anchor) == -1 for anchor in _TOTAL_ANCHORS):
+        return None
+    for label, pattern in zip(_TOTAL_LABELS, _TOTAL_RES):
+        pos = text.find(label)
+        while pos != -1:
+            match = pattern.match(text, pos)
+            if match:
+                return match.group(1)
+            pos = text.find(label, pos + 1)
+    return None
+
 
 def extract_total_from_pdf(pdf_path: Path) -> Decimal:
     """Return the total amount printed in *pdf_path* or its ``.txt`` snapshot."""
-    txt_path = pdf_path.with_suffix(".txt")
-    if txt_path.exists():
-        text = txt_path.read_text(encoding="utf-8")
-    else:
-        try:
-            import pdfplumber  # type: ignore
-        except Exception as exc:
-            raise FileNotFoundError(f"No text fallback for {pdf_path.name}") from exc
-        with pdfplumber.open(str(pdf_path)) as pdf:
-            text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-        txt_path.write_text(text, encoding="utf-8")
-
-    patterns = [
-        r"Total desta fatura\s*[=R\$\s]*([\d\.]+,\d{2})",
-        r"Total da fatura\s*[=R\$\s]*([\d\.]+,\d{2})",
-        r"Total\s*[=R\$\s]*([\d\.]+,\d{2})",
-        r"= Total desta fatura\s*[=R\$\s]*([\d\.]+,\d{2})",
-        r"TOTAL\s*[=R\$\s]*([\d\.]+,\d{2})",
-        r"Valor Total\s*[=R\$\s]*([\d\.]+,\d{2})",
-        r"Saldo Total\s*[=R\$\s]*([\d\.]+,\d{2})",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            val = match.group(1).replace(".", "").replace(",", ".")
-            return Decimal(val)
-    raise ValueError(f"Could not find total in {pdf_path.name}")
+    found = _search_total(_statement_text(pdf_path))
+    if found is None:
+        raise ValueError(f"Could not find total in {pdf_path.name}")
+    return _to_decimal(found)
+
+
+# Enhanced patterns for multi-category extraction, compiled once at import.
+# Within each category the first matching pattern wins.
+_STATEMENT_TOTAL_SOURCES: Final[Dict[str, List[str]]] = {
+    "total_due": [
+        rf"Total desta fatura\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"Total da fatura\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"TOTAL A PAGAR\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"TOTAL\s*[=R\$\s]*({_BRL_AMOUNT})",
+    ],
+    "domestic_purchases": [
+        rf"Compras nacionais\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"COMPRAS NACIONAIS\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"Lançamentos nacionais\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"LANÇAMENTOS NACIONAIS\s*[=R\$\s]*({_BRL_AMOUNT})",
+    ],
+    "international_purchases": [
+        rf"Compras internacionais\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"COMPRAS INTERNACIONAIS\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"Lançamentos internacionais\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"LANÇAMENTOS INTERNACIONAIS\s*[=R\$\s]*({_BRL_AMOUNT})",
+    ],
+    "payments": [
+        rf"Pagamentos efetuados\s*[=R\$\s]*(-?{_BRL_AMOUNT})",
+        rf"PAGAMENTOS EFETUADOS\s*[=R\$\s]*(-?{_BRL_AMOUNT})",
+        rf"Pagamentos\s*[=R\$\s]*(-?{_BRL_AMOUNT})",
+    ],
+    "fees_interest": [
+        rf"Encargos e juros\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"ENCARGOS E JUROS\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"Juros\s*[=R\$\s]*({_BRL_AMOUNT})",
+        rf"IOF\s*[=R\$\s]*({_BRL_AMOUNT})",
+    ],
+    "credits_adjustments": [
+        rf"Créditos.*?\s*[=R\$\s]*(-?{_BRL_AMOUNT})",
+        rf"CRÉDITOS.*?\s*[=R\$\s]*(-?{_BRL_AMOUNT})",
+        rf"Ajustes\s*[=R\$\s]*(-?{_BRL_AMOUNT})",
+        rf"Estornos\s*[=R\$\s]*(-?{_BRL_AMOUNT})",
+    ],
+}
+_STATEMENT_TOTAL_PATTERNS: Final[Dict[str, Tuple[re.Pattern[str], ...]]] = {
+    category: tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    for category, patterns in _STATEMENT_TOTAL_SOURCES.items()
+}
 
 
 def extract_statement_totals(pdf_path: Path) -> Dict[str, Decimal]:
     """Extract all financial totals from PDF statement summary for self-supervised training."""
-    txt_path = pdf_path.with_suffix(".txt")
-    if txt_path.exists():
-        text = txt_path.read_text(encoding="utf-8")
-    else:
-        try:
-            import pdfplumber  # type: ignore
-        except Exception as exc:
-            raise FileNotFoundError(f"No text fallback for {pdf_path.name}") from exc
-        with pdfplumber.open(str(pdf_path)) as pdf:
-            text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-        txt_path.write_text(text, encoding="utf-8")
-
-    # Enhanced patterns for multi-category extraction
-    category_patterns = {
-        "total_due": [
-            r"Total desta fatura\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"Total da fatura\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"TOTAL A PAGAR\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"= Total desta fatura\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"TOTAL\s*[=R\$\s]*([\d\.]+,\d{2})",
-        ],
-        "domestic_purchases": [
-            r"Compras nacionais\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"COMPRAS NACIONAIS\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"Lançamentos nacionais\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"LANÇAMENTOS NACIONAIS\s*[=R\$\s]*([\d\.]+,\d{2})",
-        ],
-        "international_purchases": [
-            r"Compras internacionais\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"COMPRAS INTERNACIONAIS\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"Lançamentos internacionais\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"LANÇAMENTOS INTERNACIONAIS\s*[=R\$\s]*([\d\.]+,\d{2})",
-        ],
-        "payments": [
-            r"Pagamentos efetuados\s*[=R\$\s]*(-?[\d\.]+,\d{2})",
-            r"PAGAMENTOS EFETUADOS\s*[=R\$\s]*(-?[\d\.]+,\d{2})",
-            r"Pagamentos\s*[=R\$\s]*(-?[\d\.]+,\d{2})",
-        ],
-        "fees_interest": [
-            r"Encargos e juros\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"ENCARGOS E JUROS\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"Juros\s*[=R\$\s]*([\d\.]+,\d{2})",
-            r"IOF\s*[=R\$\s]*([\d\.]+,\d{2})",
-        ],
-        "credits_adjustments": [
-            r"Créditos.*?\s*[=R\$\s]*(-?[\d\.]+,\d{2})",
-            r"CRÉDITOS.*?\s*[=R\$\s]*(-?[\d\.]+,\d{2})",
-            r"Ajustes\s*[=R\$\s]*(-?[\d\.]+,\d{2})",
-            r"Estornos\s*[=R\$\s]*(-?[\d\.]+,\d{2})",
-        ],
-    }
+    text = _statement_text(pdf_path)
 
     totals: Dict[str, Decimal] = {}
 
-    for category, patterns in category_patterns.items():
+    for category, patterns in _STATEMENT_TOTAL_PATTERNS.items():
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = pattern.search(text)
             if match:
-                val_str = match.group(1).replace(".", "").replace(",", ".")
-                totals[category] = Decimal(val_str)
+                totals[category] = _to_decimal(match.group(1))
                 break  # Use first match for each category
 
     return totals
@@ -138,25 +194,61 @@ def extract_statement_totals(pdf_path: Path) -> Dict[str, Decimal]:
 
 def calculate_csv_total(rows: Iterable[Dict]) -> Decimal:
     """Sum ``amount_brl`` values for *rows*."""
-    total = Decimal("0.00")
-    for row in rows:
-        total += Decimal(row["amount_brl"])
+    return sum(map(_to_decimal, (row["amount_brl"] for row in rows)), _ZERO)
+
+
+def calculate_csv_file_total(csv_path: Path) -> Decimal:
+    """Sum the ``amount_brl`` column of the ``;``-delimited CSV at *csv_path*.
+
+    Only the amount column is decoded, so no per-row dict is built.  Lines
+    containing an escape character fall back to :mod:`csv` so that
+    ``desc_raw`` values with an escaped ``;`` still split correctly.
+
+    Totals are memoised on the file's mtime and size, so repeated checks of
+    an unchanged golden CSV skip the read entirely.
+    """
+    stat = csv_path.stat()
+    return _csv_file_total(str(csv_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=64)
+def _csv_file_total(path: str, mtime_ns: int, size: int) -> Decimal:
+    total = _ZERO
+    with open(path, "rb", buffering=1 << 20) as fh:
+        header = fh.readline().lstrip(b"\xef\xbb\xbf").rstrip(b"\r\n").split(b";")
+        idx = header.index(b"amount_brl")
+        for line in fh:
+            line = line.rstrip(b"\r\n")
+            if not line:
+                continue
+            if b"\\" in line:
+                cols = next(
+                    csv.reader(
+                        [line.decode("utf-8")],
+                        delimiter=";",
+                        escapechar="\\",
+                        quoting=csv.QUOTE_NONE,
+                    )
+                )
+                total += Decimal(cols[idx])
+            else:
+                total += Decimal(line.split(b";")[idx].decode("ascii"))
     return total
 
 
 def calculate_category_totals(rows: Iterable[Dict]) -> Dict[str, Decimal]:
     """Calculate totals by transaction category for fitness scoring."""
     totals = {
-        "domestic": Decimal("0.00"),
-        "international": Decimal("0.00"),
-        "payments": Decimal("0.00"),
-        "services": Decimal("0.00"),
-        "adjustments": Decimal("0.00"),
-        "total": Decimal("0.00"),
+        "domestic": _ZERO,
+        "international": _ZERO,
+        "payments": _ZERO,
+        "services": _ZERO,
+        "adjustments": _ZERO,
+        "total": _ZERO,
     }
 
     for row in rows:
-        amount = Decimal(row.get("amount_brl", "0"))
+        amount = _to_decimal(row.get("amount_brl", "0"))
         category = row.get("category", "")
 
         # Total sum
@@ -247,54 +339,130 @@ def calculate_fitness_score(pdf_path: Path, rows: Iterable[Dict]) -> Dict[str, f
 
 def find_duplicates(rows: Iterable[Dict]) -> List[Tuple[str, int]]:
     """Identify duplicate transactions by ``ledger_hash``."""
-    seen: Dict[str, int] = {}
-    duplicates: List[Tuple[str, int]] = []
-    for idx, row in enumerate(rows, 1):
-        ledger = row.get("ledger_hash")
-        if ledger in seen:
-            duplicates.append((row.get("desc_raw", ""), idx))
-        elif ledger is not None:
-            seen[ledger] = idx
-    return duplicates
-
-
-_ALLOWED_CATEGORIES = {
-    "PAGAMENTO",
-    "AJUSTE",
-    "ENCARGOS",
-    "SERVIÇOS",
-    "SUPERMERCADO",
-    "FARMÁCIA",
-    "RESTAURANTE",
-    "POSTO",
-    "TRANSPORTE",
-    "TURISMO",
-    "ALIMENTAÇÃO",
-    "SAÚDE",
-    "VEÍCULOS",
-    "VESTUÁRIO",
-    "EDUCAÇÃO",
-    "HOBBY",
-    "FX",
-    "DIVERSOS",
-}
+    return _scan_rows(rows, dupes=True)["duplicates"]
+
+
+_ALLOWED_CATEGORIES: Final[frozenset[str]] = frozenset(
+    {
+        "PAGAMENTO",
+        "AJUSTE",
+        "ENCARGOS",
+        "SERVIÇOS",
+        "SUPERMERCADO",
+        "FARMÁCIA",
+        "RESTAURANTE",
+        "POSTO",
+        "TRANSPORTE",
+        "TURISMO",
+        "ALIMENTAÇÃO",
+        "SAÚDE",
+        "VEÍCULOS",
+        "VESTUÁRIO",
+        "EDUCAÇÃO",
+        "HOBBY",
+        "FX",
+        "DIVERSOS",
+    }
+)
 
 
 def validate_categories(rows: Iterable[Dict]) -> List[str]:
     """Return a list of ``"index: category"`` for invalid categories."""
-    invalid: List[str] = []
-    for idx, row in enumerate(rows, 1):
-        cat = row.get("category", "")
-        if cat not in _ALLOWED_CATEGORIES:
-            invalid.append(f"{idx}: {cat}")
-    return invalid
+    return _scan_rows(rows, invalid=True)["invalid_categories"]
 
 
 def analyze_rows(rows: Iterable[Dict]) -> Dict[str, Any]:
-    """Return basic metrics like row count and category distribution."""
-    metrics: Dict[str, Any] = {"total_rows": 0, "categories": {}}
-    for row in rows:
-        metrics["total_rows"] += 1
-        cat = row.get("category", "")
-        metrics["categories"][cat] = metrics["categories"].get(cat, 0) + 1
-    return metrics
+    """Return basic metrics like row count, category distribution and amounts.
+
+    ``min_value``/``max_value``/``avg_value`` and ``total_value`` are
+    accumulated in the same pass as the counts, so no intermediate list of
+    amounts is kept.  Missing amounts and ones that do not parse to a finite
+    number (``""``, ``"N/A"``) are left out of them and counted in
+    ``unparsed_amounts``.
+    """
+    return _scan_rows(rows, stats=True)
+
+
+def analyze_all(rows: Iterable[Dict]) -> Dict[str, Any]:
+    """Return :func:`analyze_rows` metrics plus duplicates and invalid categories.
+
+    Callers that need all three reports get them from a single traversal of
+    *rows*.  ``duplicates`` and ``invalid_categories`` match the output of
+    :func:`find_duplicates` and :func:`validate_categories`.
+    """
+    return _scan_rows(rows, stats=True, dupes=True, invalid=True)
+
+
+def _scan_rows(
+    rows: Iterable[Dict],
+    *,
+    stats: bool = False,
+    dupes: bool = False,
+    invalid: bool = False,
+) -> Dict[str, Any]:
+    """Walk *rows* once, building only the reports that were asked for.
+
+    *stats* selects the :func:`analyze_rows` metrics, *dupes* the
+    ``duplicates`` list and *invalid* the ``invalid_categories`` list.
+    """
+    categories: Dict[str, int] = {}
+    seen: set[str] = set()
+    duplicates: List[Tuple[str, int]] = []
+    flagged: List[str] = []
+    low: Decimal | None = None
+    high: Decimal | None = None
+    total = _ZERO
+    count = priced = unparsed = 0
+    # Globals and bound methods as locals: one LOAD_FAST each per row
+    allowed = _ALLOWED_CATEGORIES
+    to_decimal = _to_decimal
+    tally = categories.get
+    mark_seen = seen.add
+    report = duplicates.append
+    flag = flagged.append
+    for count, row in enumerate(rows, 1):
+        if dupes:
+            ledger = row.get("ledger_hash")
+            if ledger is not None:
+                if ledger in seen:
+                    report((row.get("desc_raw", ""), count))
+                else:
+                    mark_seen(ledger)
+        if invalid or stats:
+            cat = row.get("category", "")
+            if invalid and cat not in allowed:
+                flag(f"{count}: {cat}")
+        if not stats:
+            continue
+        categories[cat] = tally(cat, 0) + 1
+        raw = row.get("amount_brl")
+        try:
+            value = None if raw is None else to_decimal(raw)
+        except (InvalidOperation, TypeError, ValueError):
+            value = None
+        if value is None or not value.is_finite():
+            unparsed += 1
+            continue
+        if low is None or value < low:
+            low = value
+        if high is None or value > high:
+            high = value
+        total += value
+        priced += 1
+
+    result: Dict[str, Any] = {}
+    if stats:
+        result.update(
+            total_rows=count,
+            categories=categories,
+            min_value=_ZERO if low is None else low,
+            max_value=_ZERO if high is None else high,
+            avg_value=total / priced if priced else _ZERO,
+            unparsed_amounts=unparsed,
+            total_value=total,
+        )
+    if dupes:
+        result["duplicates"] = duplicates
+    if invalid:
+        result["invalid_categories"] = flagged
+    return result
@@ -1,5 +1,90 @@
+import hashlib
+import os
+import shutil
 import sys
 from pathlib import Path
 
+import pytest
+
 # Ensure the package under src/ is importable without installation
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+SAMPLE_PDF = DATA_DIR / "Itau_2024-10.pdf"
+
+
+def pytest_addoption(parser):
+    """Add the invariant suite's command line options."""
+    parser.addoption(
+        "--csv-dir",
+        action="store",
+        default="csv_output",
+        help="Directory containing parsed CSV files",
+    )
+
+
+@pytest.fixture(scope="session")
+def sample_pdf() -> Path:
+    """Path to the reference statement shared by the sample-based tests."""
+    if not SAMPLE_PDF.exists():
+        pytest.skip("sample data missing")
+    return SAMPLE_PDF
+
+
+@pytest.fixture(scope="session")
+def sample_text(request: pytest.FixtureRequest, sample_pdf: Path) -> str:
+    """Text of the sample statement, extracted once per test session.
+
+    The text is also kept in pytest's cache directory, keyed on the PDF bytes,
+    the parser source and the ``SR_PDF_BACKEND`` engine, so warm runs skip
+    extraction altogether.
+    """
+    pytest.importorskip("pdfplumber")
+    from statement_refinery import pdf_to_csv
+
+    cache = getattr(request.config, "cache", None)
+    key = "statement_refinery/sample_text/" + "-".join(
+        [
+            *(
+                hashlib.md5(path.read_bytes()).hexdigest()[:16]
+                for path in (sample_pdf, Path(pdf_to_csv.__file__))
+            ),
+            pdf_to_csv._pdf_backend(),
+        ]
+    )
+    text = cache.get(key, None) if cache is not None else None
+    if text is None:
+        text = "\n".join(pdf_to_csv.iter_pdf_lines(sample_pdf))
+        if cache is not None:
+            cache.set(key, text)
+    return text
+
+
+@pytest.fixture(scope="session")
+def sample_rows(sample_pdf: Path) -> list[dict]:
+    """Rows of the sample statement, parsed once per test session."""
+    from statement_refinery.pdf_to_csv import parse_pdf
+
+    return parse_pdf(sample_pdf)
+
+
+@pytest.fixture
+def link_asset(tmp_path: Path):
+    """Stage read-only test assets in ``tmp_path/data`` without copying bytes.
+
+    Files are hard-linked when the filesystem allows it and copied otherwise.
+    Never hand the result to code that rewrites the file in place: a hard
+    link shares its contents with the original under ``tests/data``.
+    """
+    data_dir = tmp_path / "data"
+    data_dir.mkdir(exist_ok=True)
+
+    def _link(src: Path) -> Path:
+        dst = data_dir / src.name
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+        return dst
+
+    return _link
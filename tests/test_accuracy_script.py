@@ -1,5 +1,5 @@
+import csv
 import importlib.util
-import shutil
 import sys
 from decimal import Decimal
 from pathlib import Path
@@ -18,43 +18,68 @@ assert mod_spec.loader
 mod_spec.loader.exec_module(mod)
 
 
+def _stage_sample(monkeypatch, link_asset, sample_pdf, sample_text) -> Path:
+    """Stage the sample PDF and its text in ``tmp_path/data`` for ``main``."""
+    data_dir = link_asset(sample_pdf).parent
+    sample_pdf_copy = data_dir / sample_pdf.name
+    sample_pdf_copy.with_suffix(".txt").write_text(sample_text, encoding="utf-8")
+    monkeypatch.setattr(mod, "DATA_DIR", data_dir)
+    # The fallback parse writes diagnostics/ into the working directory
+    monkeypatch.chdir(data_dir.parent)
+    summary = data_dir.parent / "accuracy_summary.json"
+    monkeypatch.setattr(sys, "argv", ["check_accuracy", "--summary-file", str(summary)])
+    return data_dir
+
+
+def _golden_total(golden: Path) -> Decimal:
+    """Sum ``amount_brl`` so tests can isolate the check they exercise."""
+    with golden.open(newline="", encoding="utf-8") as fh:
+        return sum(
+            (Decimal(row["amount_brl"]) for row in csv.DictReader(fh, delimiter=";")),
+            Decimal("0.00"),
+        )
+
+
+def test_check_accuracy_main_passes_on_clean_golden(
+    monkeypatch, link_asset, sample_pdf, sample_text
+):
+    _stage_sample(monkeypatch, link_asset, sample_pdf, sample_text)
+    golden = link_asset(sample_pdf.with_name("golden_2024-10.csv"))
+    # The sample golden and the statement's printed total disagree, so the
+    # PDF total is pinned to the golden sum to check main's success path.
+    total = _golden_total(golden)
+    monkeypatch.setattr(mod, "extract_total_from_pdf", lambda _: total)
+    mod.main()
+
+
 @pytest.mark.parametrize("has_pdfplumber", [True, False])
-def test_check_accuracy_main_fails_on_mismatch(monkeypatch, tmp_path, has_pdfplumber):
-    data_dir = tmp_path / "data"
-    data_dir.mkdir()
-    sample_pdf = Path(__file__).parent / "data" / "itau_2024-10.pdf"
-    sample_txt = Path(__file__).parent / "data" / "itau_2024-10.txt"
-    sample_golden = Path(__file__).parent / "data" / "golden_2024-10.csv"
-    if not sample_pdf.exists() or not sample_txt.exists():
-        pytest.skip("sample data missing")
-    shutil.copy(sample_pdf, data_dir / sample_pdf.name)
-    shutil.copy(sample_txt, data_dir / sample_txt.name)
+def test_check_accuracy_main_fails_on_mismatch(
+    monkeypatch, link_asset, sample_pdf, sample_text, has_pdfplumber
+):
+    sample_golden = sample_pdf.with_name("golden_2024-10.csv")
+    data_dir = _stage_sample(monkeypatch, link_asset, sample_pdf, sample_text)
+    # The golden CSV is edited, so it is written fresh instead of linked
     broken_golden = data_dir / sample_golden.name
     lines = sample_golden.read_text().splitlines()
-    lines[1] = lines[1].replace(".00", ".01")
+    fields = lines[1].split(";")
+    fields[3] = str(Decimal(fields[3]) + 1)
+    lines[1] = ";".join(fields)
     broken_golden.write_text("\n".join(lines) + "\n")
 
-    monkeypatch.setattr(mod, "DATA_DIR", data_dir)
+    total = _golden_total(sample_golden)
+    monkeypatch.setattr(mod, "extract_total_from_pdf", lambda _: total)
     if not has_pdfplumber:
         monkeypatch.setattr(mod, "HAS_PDFPLUMBER", False)
-    with pytest.raises(SystemExit):
+    with pytest.raises(SystemExit, match="mismatched"):
         mod.main()
 
 
-def test_check_accuracy_fails_on_total_delta(monkeypatch, tmp_path):
-    data_dir = tmp_path / "data"
-    data_dir.mkdir()
-    sample_pdf = Path(__file__).parent / "data" / "itau_2024-10.pdf"
-    sample_txt = Path(__file__).parent / "data" / "itau_2024-10.txt"
-    sample_golden = Path(__file__).parent / "data" / "golden_2024-10.csv"
-    if not sample_pdf.exists() or not sample_txt.exists():
-        pytest.skip("sample data missing")
-    shutil.copy(sample_pdf, data_dir / sample_pdf.name)
-    shutil.copy(sample_txt, data_dir / sample_txt.name)
-    shutil.copy(sample_golden, data_dir / sample_golden.name)
+def test_check_accuracy_fails_on_total_delta(
+    monkeypatch, link_asset, sample_pdf, sample_text
+):
+    _stage_sample(monkeypatch, link_asset, sample_pdf, sample_text)
+    link_asset(sample_pdf.with_name("golden_2024-10.csv"))
 
-    monkeypatch.setattr(mod, "DATA_DIR", data_dir)
     monkeypatch.setattr(mod, "extract_total_from_pdf", lambda _: Decimal("0.00"))
-    monkeypatch.setattr(mod, "HAS_PDFPLUMBER", False)
-    with pytest.raises(SystemExit):
+    with pytest.raises(SystemExit, match="mismatched"):
         mod.main()
@@ -6,15 +6,22 @@ import pytest
 
 from statement_refinery.pdf_to_csv import (
     _iso_date,
+    _ledger_hash,
     classify_transaction,
+    clean_line,
     parse_amount,
     parse_fx_currency_line,
     parse_statement_line,
 )
 
+# Parsed rows without an explicit year default to the current one
+_CURRENT_YEAR = date.today().year
 
-def _expected_hash(line: str) -> str:
-    return hashlib.sha1(line.encode("utf-8")).hexdigest()
+
+def test_ledger_hash_stays_sha1():
+    # Golden CSVs store these digests, so the algorithm must not drift
+    line = "28/09 FARMACIA SAO JOAO 01/04 final 6853 21,73"
+    assert _ledger_hash(line) == hashlib.sha1(line.encode("utf-8")).hexdigest()
 
 
 def test_domestic_transaction():
@@ -22,23 +29,21 @@ def test_domestic_transaction():
     row = parse_statement_line(line)
     assert row is not None
     assert row["card_last4"] == "6853"
-    year = date.today().year
-    assert row["post_date"] == f"{year}-09-28"
+    assert row["post_date"] == f"{_CURRENT_YEAR}-09-28"
     assert row["desc_raw"] == "FARMACIA SAO JOAO 01/04"
     assert row["amount_brl"] == Decimal("21.73")
     assert row["installment_seq"] == 1
     assert row["installment_tot"] == 4
     assert row["category"] == "FARMÁCIA"
     assert row["fx_rate"] == Decimal("0.00")
-    assert row["ledger_hash"] == _expected_hash(line)
+    assert row["ledger_hash"] == _ledger_hash(line)
 
 
 def test_fx_transaction():
     line = "10/04 SumUp *BOTISRL 7,90 56,12\nEUR 1,00 = 6,27 BRL Milano"
     row = parse_statement_line(line)
     assert row is not None
-    year = date.today().year
-    assert row["post_date"] == f"{year}-04-10"
+    assert row["post_date"] == f"{_CURRENT_YEAR}-04-10"
     assert row["desc_raw"] == "SumUp *BOTISRL"
     assert row["amount_orig"] == Decimal("7.90")
     assert row["amount_brl"] == Decimal("56.12")
@@ -68,10 +73,9 @@ def test_complex_merchant_parsed():
     line = "31/12 COMPLEX MERCHANT NAME WITH SPECIAL CHARS @#$ 99,99"
     row = parse_statement_line(line)
     assert row is not None
-    year = date.today().year
     assert row == {
         "card_last4": "0000",
-        "post_date": f"{year}-12-31",
+        "post_date": f"{_CURRENT_YEAR}-12-31",
         "desc_raw": "COMPLEX MERCHANT NAME WITH SPECIAL CHARS @#$",
         "amount_brl": Decimal("99.99"),
         "installment_seq": 0,
@@ -80,7 +84,7 @@ def test_complex_merchant_parsed():
         "iof_brl": Decimal("0.00"),
         "category": "DIVERSOS",
         "merchant_city": "",
-        "ledger_hash": _expected_hash(line),
+        "ledger_hash": _ledger_hash(line),
         "prev_bill_amount": Decimal("0.00"),
         "interest_amount": Decimal("0.00"),
         "amount_orig": Decimal("0.00"),
@@ -135,6 +139,18 @@ def test_parse_amount_parentheses():
     assert parse_amount("(1.234,56)") == Decimal("-1234.56")
 
 
+def test_clean_line_strips_glyphs_and_spacing():
+    assert (
+        clean_line("\ue001>@ 01/02 LOJA_X   STORE\t\t9,99 ")
+        == "01/02 LOJA X STORE 9,99"
+    )
+
+
+def test_parse_amount_plain_zero_keeps_sign_free():
+    assert str(parse_amount("-0,00")) == "0.00"
+    assert str(parse_amount(" 1234567,89 ")) == "1234567.89"
+
+
 def test_classify_transaction_high_priority():
     cat = classify_transaction("Cobrança IOF", Decimal("10"))
     assert cat == "ENCARGOS"
@@ -1,6 +1,22 @@
+import contextlib
+import csv
+import io
+import os
+import re
 from decimal import Decimal
+from itertools import islice
 
-from statement_refinery.pdf_to_csv import parse_lines
+import pytest
+
+from statement_refinery import pdf_to_csv
+from statement_refinery.pdf_to_csv import (
+    CSV_HEADER,
+    iter_pdf_lines,
+    main,
+    parse_lines,
+    parse_pdf,
+    write_csv,
+)
 
 
 def test_parse_lines_simple():
@@ -8,3 +24,183 @@ def test_parse_lines_simple():
     rows = parse_lines(iter(lines))
     assert rows[0]["amount_brl"] == Decimal("9.99")
     assert rows[0]["card_last4"] == "1234"
+
+
+def test_parse_pdf_uses_golden(sample_pdf, sample_rows):
+    golden = sample_pdf.with_name("golden_2024-10.csv")
+    lines = golden.read_text(encoding="utf-8").splitlines()[1:]
+    # parse_pdf drops repeated ledger hashes while keeping golden order
+    expected = list(dict.fromkeys(line.split(";")[10] for line in lines))
+    assert [r["ledger_hash"] for r in sample_rows] == expected
+    assert all(isinstance(r["amount_brl"], Decimal) for r in sample_rows)
+
+
+def test_write_csv_roundtrip(sample_rows):
+    buf = io.StringIO()
+    write_csv(sample_rows, buf)
+    lines = buf.getvalue().split("\r\n")
+    assert lines[0] == ";".join(CSV_HEADER)
+    reader = csv.reader(lines[1:], delimiter=";", escapechar="\\")
+    first = dict(zip(CSV_HEADER, next(reader)))
+    assert first["ledger_hash"] == sample_rows[0]["ledger_hash"]
+    assert Decimal(first["amount_brl"]) == sample_rows[0]["amount_brl"]
+
+
+def test_write_csv_fills_missing_and_rejects_extra_keys():
+    row = {"card_last4": "1234", "desc_raw": "A;B"}
+    buf = io.StringIO()
+    write_csv([row], buf)
+    line = buf.getvalue().split("\r\n")[1]
+    values = next(csv.reader([line], delimiter=";", escapechar="\\"))
+    assert dict(zip(CSV_HEADER, values)) == {
+        key: row.get(key, "") for key in CSV_HEADER
+    }
+
+    with pytest.raises(ValueError, match="bogus"):
+        write_csv([{"card_last4": "1234", "bogus": "x"}], io.StringIO())
+
+
+def test_main_stdout_golden(sample_pdf):
+    golden = sample_pdf.with_name("golden_2024-10.csv")
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        main([str(sample_pdf)])
+    assert buf.getvalue() == golden.read_text(encoding="utf-8")
+
+
+def test_parse_pdf_memoises_until_source_changes(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    pdf = tmp_path / "itau_2099-01.pdf"
+    txt = pdf.with_suffix(".txt")
+    txt.write_text("01/01 STORE final 1234 9,99", encoding="utf-8")
+    first = parse_pdf(pdf)
+    first[0]["desc_raw"] = "MUTATED"
+    assert parse_pdf(pdf)[0]["desc_raw"] != "MUTATED"
+
+    txt.write_text("01/01 STORE final 1234 19,99", encoding="utf-8")
+    stat = txt.stat()
+    os.utime(txt, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert parse_pdf(pdf)[0]["amount_brl"] == Decimal("19.99")
+
+
+def test_iter_pdf_lines_pdfium_backend(monkeypatch, sample_pdf):
+    pytest.importorskip("pypdfium2")
+    monkeypatch.setenv("SR_PDF_BACKEND", "pdfium")
+    lines = list(iter_pdf_lines(sample_pdf))
+    assert lines
+    assert all(line == line.rstrip() and line for line in lines)
+
+
+def test_iter_pdf_lines_rejects_unknown_backend(monkeypatch, sample_pdf):
+    monkeypatch.setenv("SR_PDF_BACKEND", "nope")
+    with pytest.raises(ValueError, match="SR_PDF_BACKEND"):
+        next(iter_pdf_lines(sample_pdf))
+
+
+def test_iter_pdf_lines_streams_pages(monkeypatch, tmp_path):
+    opened = []
+
+    def fake_pages(pdf_path):
+        for page in ("01/01 A 1,00\n01/02 B 2,00", "01/03 C 3,00", None, "x"):
+            opened.append(page)
+            yield page
+
+    monkeypatch.setitem(pdf_to_csv._PDF_BACKENDS, "pdfplumber", fake_pages)
+    monkeypatch.delenv("SR_PDF_BACKEND", raising=False)
+    lines = iter_pdf_lines(tmp_path / "lazy.pdf")
+    # Only the pages needed for the requested prefix are extracted
+    assert list(islice(lines, 3)) == ["01/01 A 1,00", "01/02 B 2,00", "01/03 C 3,00"]
+    assert len(opened) == 2
+    assert list(lines) == ["x"]
+
+
+def test_iter_pdf_lines_stops_at_marker(monkeypatch, tmp_path):
+    opened = []
+
+    def fake_pages(pdf_path):
+        for page in ("01/01 A 1,00\nCentral de Atendimento", "01/02 B 2,00"):
+            opened.append(page)
+            yield page
+
+    monkeypatch.setitem(pdf_to_csv._PDF_BACKENDS, "pdfplumber", fake_pages)
+    monkeypatch.delenv("SR_PDF_BACKEND", raising=False)
+    pdf = tmp_path / "stop.pdf"
+    stop_re = re.compile(r"Central de Atendimento")
+    assert list(iter_pdf_lines(pdf, stop_re)) == ["01/01 A 1,00"]
+    assert len(opened) == 1
+    assert len(list(iter_pdf_lines(pdf))) == 3
+
+
+def test_parse_pdf_refreshes_stale_sidecar(monkeypatch, tmp_path):
+    monkeypatch.setitem(
+        pdf_to_csv._PDF_BACKENDS,
+        "pdfplumber",
+        lambda pdf_path: iter(["01/01 STORE final 1234 5,00"]),
+    )
+    monkeypatch.delenv("SR_PDF_BACKEND", raising=False)
+    monkeypatch.chdir(tmp_path)
+    pdf = tmp_path / "itau_2099-02.pdf"
+    pdf.touch()
+    txt = pdf.with_suffix(".txt")
+    txt.write_text("01/01 STORE final 1234 9,99", encoding="utf-8")
+    stat = pdf.stat()
+    os.utime(txt, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1_000_000_000))
+
+    assert parse_pdf(pdf)[0]["amount_brl"] == Decimal("5.00")
+    assert txt.read_text(encoding="utf-8") == "01/01 STORE final 1234 5,00"
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        ["diagnostics", pdf.name, txt.name]
+    )
+
+
+def test_parse_pdf_keeps_opt_in_backend_text_out_of_sidecar(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(
+        pdf_to_csv._PDF_BACKENDS,
+        "pdfium",
+        lambda pdf_path: iter(["01/01 STORE final 1234 7,00"]),
+    )
+    monkeypatch.setitem(
+        pdf_to_csv._PDF_BACKENDS,
+        "pdfplumber",
+        lambda pdf_path: iter(["01/01 STORE final 1234 5,00"]),
+    )
+    pdf = tmp_path / "itau_2099-03.pdf"
+    pdf.touch()
+
+    monkeypatch.setenv("SR_PDF_BACKEND", "pdfium")
+    assert parse_pdf(pdf)[0]["amount_brl"] == Decimal("7.00")
+    assert not pdf.with_suffix(".txt").exists()
+
+    # The default run neither reuses the opt-in parse nor its text
+    monkeypatch.delenv("SR_PDF_BACKEND")
+    assert parse_pdf(pdf)[0]["amount_brl"] == Decimal("5.00")
+    assert pdf.with_suffix(".txt").read_text(encoding="utf-8").endswith("5,00")
+
+
+def test_parse_lines_logs_to_debug_path(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    parse_lines(iter(["01/01 STORE final 1234 5,00"]))
+    log = tmp_path / "diagnostics" / "parse_debug.txt"
+    assert log.read_text(encoding="utf-8").startswith("Processing line: 01/01 STORE")
+
+    custom = tmp_path / "logs" / "custom.txt"
+    parse_lines(iter(["01/01 OTHER final 1234 6,00"]), debug_path=custom)
+    assert "OTHER" in custom.read_text(encoding="utf-8")
+    assert "OTHER" not in log.read_text(encoding="utf-8")
+
+
+def test_parse_pdf_writes_one_debug_log_per_statement(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for stem, amount in (("itau_2099-03", "5,00"), ("itau_2099-04", "6,00")):
+        txt = tmp_path / f"{stem}.txt"
+        txt.write_text(f"01/01 STORE final 1234 {amount}", encoding="utf-8")
+        parse_pdf(tmp_path / f"{stem}.pdf")
+
+    diag = tmp_path / "diagnostics"
+    assert sorted(p.name for p in diag.iterdir()) == [
+        "itau_2099-03.parse_debug.txt",
+        "itau_2099-04.parse_debug.txt",
+    ]
+    log = (diag / "itau_2099-04.parse_debug.txt").read_text(encoding="utf-8")
+    assert "6,00" in log and "5,00" not in log
@@ -1,20 +1,28 @@
+from functools import lru_cache
+from pathlib import Path
+
 import pytest
 import yaml
-from pathlib import Path
+
+try:  # LibYAML bindings are optional
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _Loader
 
 CONFIG_PATH = Path(".pre-commit-config.yaml")
 
 
+@lru_cache(maxsize=1)
 def load_config():
-    with CONFIG_PATH.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+    """Parse the config once; the tests only read from it."""
+    with CONFIG_PATH.open("rb") as f:
+        return yaml.load(f, Loader=_Loader)
 
 
 def test_pre_commit_config_valid():
     """Test that the .pre-commit-config.yaml file is valid YAML."""
     try:
-        with open(".pre-commit-config.yaml", "r") as f:
-            yaml.safe_load(f)
+        load_config()
     except Exception as e:
         pytest.fail(f"YAML syntax error: {e}")
 
@@ -1,8 +1,13 @@
+import os
 from decimal import Decimal
 from pathlib import Path
 
+import pytest
+
 from statement_refinery.validation import (
+    analyze_all,
     analyze_rows,
+    calculate_csv_file_total,
     calculate_csv_total,
     extract_total_from_pdf,
     find_duplicates,
@@ -18,6 +23,26 @@ def test_extract_total_from_pdf(tmp_path: Path) -> None:
     assert extract_total_from_pdf(pdf) == Decimal("1234.56")
 
 
+def test_extract_total_from_pdf_sample(tmp_path: Path, sample_text: str) -> None:
+    pdf = tmp_path / "sample.pdf"
+    pdf.touch()
+    pdf.with_suffix(".txt").write_text(sample_text, encoding="utf-8")
+    assert extract_total_from_pdf(pdf) == Decimal("8595.02")
+
+
+def test_extract_total_from_pdf_follows_snapshot(tmp_path: Path) -> None:
+    pdf = tmp_path / "sample.pdf"
+    pdf.write_bytes(b"%PDF-1.4 v1")
+    txt = pdf.with_suffix(".txt")
+    txt.write_text("Total desta fatura R$ 10,00", encoding="utf-8")
+    assert extract_total_from_pdf(pdf) == Decimal("10.00")
+
+    # A rewritten snapshot is read again; no earlier total is kept around
+    txt.write_text("Total desta fatura R$ 20,00", encoding="utf-8")
+    assert extract_total_from_pdf(pdf) == Decimal("20.00")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["sample.pdf", "sample.txt"]
+
+
 def test_calculate_csv_total() -> None:
     rows = [
         {"amount_brl": Decimal("1.00")},
@@ -35,6 +60,16 @@ def test_find_duplicates() -> None:
     assert find_duplicates(rows) == [("C", 3)]
 
 
+def test_find_duplicates_ignores_missing_hash() -> None:
+    rows = [
+        {"desc_raw": "A"},
+        {"desc_raw": "B"},
+        {"ledger_hash": "x", "desc_raw": "C"},
+        {"ledger_hash": "x", "desc_raw": "D"},
+    ]
+    assert find_duplicates(rows) == [("D", 4)]
+
+
 def test_validate_categories() -> None:
     rows = [
         {"category": "DIVERSOS"},
@@ -52,3 +87,104 @@ def test_analyze_rows() -> None:
     metrics = analyze_rows(rows)
     assert metrics["total_rows"] == 3
     assert metrics["categories"] == {"DIVERSOS": 2, "FX": 1}
+
+
+def test_calculate_csv_file_total(tmp_path: Path) -> None:
+    csv_path = tmp_path / "rows.csv"
+    csv_path.write_text(
+        "card_last4;desc_raw;amount_brl\r\n"
+        "1234;STORE;10.50\r\n"
+        "1234;A\\;B;-0.25\r\n"
+        "1234;OTHER;1.00",
+        encoding="utf-8",
+    )
+    assert calculate_csv_file_total(csv_path) == Decimal("11.25")
+
+    csv_path.write_text("amount_brl\r\n2.00\r\n", encoding="utf-8")
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert calculate_csv_file_total(csv_path) == Decimal("2.00")
+
+
+def test_calculate_csv_total_accepts_strings() -> None:
+    rows = [{"amount_brl": "1.10"}, {"amount_brl": Decimal("-0.10")}]
+    assert calculate_csv_total(rows) == Decimal("1.00")
+    assert calculate_csv_total([]) == Decimal("0.00")
+
+
+def test_analyze_rows_amount_stats() -> None:
+    rows = [
+        {"category": "FX", "amount_brl": Decimal("10.00")},
+        {"category": "FX", "amount_brl": "-4.00"},
+        {"category": "DIVERSOS", "amount_brl": "3.00"},
+    ]
+    metrics = analyze_rows(rows)
+    assert metrics["min_value"] == Decimal("-4.00")
+    assert metrics["max_value"] == Decimal("10.00")
+    assert metrics["avg_value"] == Decimal("3.00")
+    assert analyze_rows([])["avg_value"] == Decimal("0.00")
+
+
+def test_analyze_rows_skips_unparsable_amounts() -> None:
+    rows = [
+        {"category": "FX", "amount_brl": ""},
+        {"category": "FX", "amount_brl": "N/A"},
+        {"category": "FX", "amount_brl": "NaN"},
+        {"category": "FX", "amount_brl": 1.1},
+        {"category": "FX", "amount_brl": "2.00"},
+        {"category": "FX"},
+    ]
+    metrics = analyze_rows(rows)
+    assert metrics["total_rows"] == 6
+    assert metrics["unparsed_amounts"] == 4
+    assert metrics["min_value"] == Decimal("1.1")
+    assert metrics["max_value"] == Decimal("2.00")
+    assert metrics["avg_value"] == Decimal("1.55")
+
+
+def test_extract_total_from_pdf_snapshot_lines(tmp_path: Path) -> None:
+    pdf = tmp_path / "sample.pdf"
+    pdf.touch()
+    txt = pdf.with_suffix(".txt")
+    txt.write_text("Cartão Itaú\nTotal desta fatura R$ 1.234,56\n", encoding="utf-8")
+    assert extract_total_from_pdf(pdf) == Decimal("1234.56")
+
+    empty = tmp_path / "empty.pdf"
+    empty.touch()
+    empty.with_suffix(".txt").touch()
+    with pytest.raises(ValueError):
+        extract_total_from_pdf(empty)
+
+
+def test_extract_total_from_pdf_non_breaking_space(tmp_path: Path) -> None:
+    pdf = tmp_path / "sample.pdf"
+    pdf.touch()
+    pdf.with_suffix(".txt").write_text(
+        "Total desta fatura\xa0R$\xa01.234,56\n", encoding="utf-8"
+    )
+    assert extract_total_from_pdf(pdf) == Decimal("1234.56")
+
+
+def test_extract_total_from_pdf_skips_label_without_amount(tmp_path: Path) -> None:
+    pdf = tmp_path / "sample.pdf"
+    pdf.touch()
+    pdf.with_suffix(".txt").write_text(
+        "Total desta fatura\nVencimento 10/11\nTotal desta fatura R$ 5,00\n"
+        "Total desta fatura R$ 7,00\n",
+        encoding="utf-8",
+    )
+    assert extract_total_from_pdf(pdf) == Decimal("5.00")
+
+
+def test_analyze_all_matches_individual_helpers() -> None:
+    rows = [
+        {"ledger_hash": "a", "desc_raw": "A", "category": "FX", "amount_brl": "1.00"},
+        {"ledger_hash": "b", "desc_raw": "B", "category": "BAD", "amount_brl": "2.00"},
+        {"ledger_hash": "a", "desc_raw": "C", "category": "FX", "amount_brl": "3.00"},
+    ]
+    report = analyze_all(iter(rows))
+    assert report["duplicates"] == find_duplicates(rows)
+    assert report["invalid_categories"] == validate_categories(rows)
+    assert report["total_value"] == calculate_csv_total(rows)
+    metrics = analyze_rows(rows)
+    assert {key: report[key] for key in metrics} == metrics
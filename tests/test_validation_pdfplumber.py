@@ -1,60 +1,45 @@
 from decimal import Decimal
-import pytest
-from statement_refinery.validation import extract_total_from_pdf
 
+import pytest
 
-def test_extract_total_from_pdf_pdfplumber(monkeypatch, tmp_path):
-    # Simulate a PDF file with pdfplumber fallback
-    pdf = tmp_path / "sample.pdf"
-    pdf.touch()
-    # Remove .txt so pdfplumber path is used
-    txt = pdf.with_suffix(".txt")
-    if txt.exists():
-        txt.unlink()
+from statement_refinery import pdf_to_csv
+from statement_refinery.validation import extract_total_from_pdf
 
-    class DummyPage:
-        def extract_text(self):
-            return "Total desta fatura R$ 2.345,67"
 
-    class DummyPDF:
-        pages = [DummyPage()]
+class DummyPage:
+    def __init__(self, text):
+        self.text = text
 
-        def __enter__(self):
-            return self
+    def extract_text(self):
+        return self.text
 
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            pass
 
-    def dummy_open(path):
-        return DummyPDF()
+class DummyPDF:
+    def __init__(self, text):
+        self.pages = [DummyPage(text)]
 
-    monkeypatch.setattr("pdfplumber.open", dummy_open)
+    def __enter__(self):
+        return self
 
-    result = extract_total_from_pdf(pdf)
-    assert result == Decimal("2345.67")
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
 
 
-def test_extract_total_from_pdf_no_total(monkeypatch, tmp_path):
+@pytest.fixture
+def pdf(tmp_path, monkeypatch):
+    # Empty PDF without a .txt sidecar, so the pdfplumber path is used
     pdf = tmp_path / "sample.pdf"
     pdf.touch()
-    txt = pdf.with_suffix(".txt")
-    txt.write_text("No total here", encoding="utf-8")
-    with pytest.raises(ValueError):
-        extract_total_from_pdf(pdf)
+    pdf.with_suffix(".txt").unlink(missing_ok=True)
+    monkeypatch.delenv("SR_PDF_BACKEND", raising=False)
+    return pdf
 
 
-def test_extract_total_from_pdf_pdfplumber_missing(monkeypatch, tmp_path):
-    # Simulate a PDF file with no .txt and missing pdfplumber
+def _fail_pdfplumber_import(monkeypatch):
+    # Remove pdfplumber from sys.modules to simulate ImportError
     import sys
 
-    pdf = tmp_path / "sample.pdf"
-    pdf.touch()
-    txt = pdf.with_suffix(".txt")
-    if txt.exists():
-        txt.unlink()
-
-    # Remove pdfplumber from sys.modules to simulate ImportError
-    sys.modules.pop("pdfplumber", None)
+    monkeypatch.delitem(sys.modules, "pdfplumber", raising=False)
     original_import = __import__
 
     def import_fail(name, *args, **kwargs):
@@ -64,5 +49,39 @@ def test_extract_total_from_pdf_pdfplumber_missing(monkeypatch, tmp_path):
 
     monkeypatch.setattr("builtins.__import__", import_fail)
 
-    with pytest.raises(FileNotFoundError):
+
+@pytest.mark.parametrize(
+    "text,expected,exc",
+    [
+        ("Total desta fatura R$ 2.345,67", Decimal("2345.67"), None),
+        ("No total here", None, ValueError),
+        (None, None, FileNotFoundError),
+    ],
+    ids=["total", "no_total", "pdfplumber_missing"],
+)
+def test_extract_total_from_pdf_pdfplumber(monkeypatch, pdf, text, expected, exc):
+    if text is None:
+        _fail_pdfplumber_import(monkeypatch)
+    else:
+        monkeypatch.setattr("pdfplumber.open", lambda path: DummyPDF(text))
+
+    if exc is None:
+        assert extract_total_from_pdf(pdf) == expected
+    else:
+        with pytest.raises(exc):
+            extract_total_from_pdf(pdf)
+
+
+def test_extract_total_from_pdf_opt_in_backend(monkeypatch, pdf):
+    monkeypatch.setitem(
+        pdf_to_csv._PDF_BACKENDS, "pdfium", lambda path: iter(["Total R$ 3,00"])
+    )
+    monkeypatch.setattr("pdfplumber.open", pytest.fail)
+    monkeypatch.setenv("SR_PDF_BACKEND", "pdfium")
+    assert extract_total_from_pdf(pdf) == Decimal("3.00")
+    # Only pdfplumber text may become the snapshot pdf_to_csv parses
+    assert not pdf.with_suffix(".txt").exists()
+
+    monkeypatch.setenv("SR_PDF_BACKEND", "bogus")
+    with pytest.raises(ValueError, match="SR_PDF_BACKEND"):
         extract_total_from_pdf(pdf)